@@ -1,81 +1,195 @@
 import sqlite3
+import atexit
+import functools
+import sys
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
+
+def _now_epoch() -> int:
+    # Current time as unix seconds, the format timestamps are stored in
+    return int(time.time())
+
+
 # Configure SQLite to handle datetime properly (fixes Python 3.12 deprecation warning)
-sqlite3.register_adapter(datetime, lambda dt: dt.isoformat())
-sqlite3.register_converter("TIMESTAMP", lambda s: datetime.fromisoformat(s.decode()))
+sqlite3.register_adapter(datetime, lambda dt: int(dt.timestamp()))
+sqlite3.register_converter("TIMESTAMP", lambda s: datetime.fromtimestamp(int(s)))
+
+# Frequently executed statements, shared so they hit the connection's statement cache
+_SQL_GET_AVAILABLE_BIKES = 'SELECT id, bike_type, model, hourly_rate, daily_rate FROM bikes WHERE is_available = 1'
+_SQL_RESERVE_BIKE = '''
+    UPDATE bikes SET is_available = 0
+    WHERE id = ? AND is_available = 1
+    RETURNING id, bike_type, model, hourly_rate, daily_rate
+'''
+_SQL_RELEASE_BIKE = 'UPDATE bikes SET is_available = 1 WHERE id = ?'
+_SQL_INSERT_RENTAL = '''
+    INSERT INTO rentals (customer_id, bike_id, rental_start, planned_duration_hours, base_cost, total_cost)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_SQL_GET_ACTIVE_RENTAL = '''
+    SELECT r.id, r.customer_id, r.bike_id, r.rental_start, r.rental_end,
+           r.planned_duration_hours, r.base_cost, r.additional_charges, r.total_cost, r.status,
+           b.bike_type, b.model, b.hourly_rate, b.daily_rate
+    FROM rentals r
+    JOIN bikes b ON r.bike_id = b.id
+    WHERE r.id = ? AND r.customer_id = ? AND r.status = 'ACTIVE'
+'''
+_SQL_COMPLETE_RENTAL = '''
+    UPDATE rentals SET
+        rental_end = ?,
+        actual_duration_hours = ?,
+        additional_charges = ?,
+        total_cost = ?,
+        status = 'COMPLETED'
+    WHERE id = ?
+'''
+
+# Rental lengths (in hours) shown as sample pricing in the bike listing
+_SAMPLE_HOURS = (2, 8, 24)
+
+# Output templates for the per-row listings
+_BIKE_ROW = ("\n🚴 ID: %s\n"
+             "   %s\n"
+             "   Model: %s\n"
+             "   Rates: $%.2f/hour | $%.2f/day\n"
+             "   Sample pricing: %s\n")
+_RENTAL_ROW_COMPLETED = ("\n📋 Rental ID: %s\n"
+                         "   Bike: %s - %s\n"
+                         "   Start: %s\n"
+                         "   End: %s\n"
+                         "   Duration: %.2f hours\n"
+                         "   Cost: $%.2f\n"
+                         "   Status: %s\n")
+_RENTAL_ROW_OPEN = ("\n📋 Rental ID: %s\n"
+                    "   Bike: %s - %s\n"
+                    "   Start: %s\n"
+                    "   Planned Duration: %s hours\n"
+                    "   Cost: $%.2f\n"
+                    "   Status: %s\n")
 
 
 # Database setup and connection
 class DatabaseManager:
     def __init__(self, db_name="bike_rental.db"):
         self.db_name = db_name
+
+        # Keep a single connection open for the lifetime of the process
+        self._conn = sqlite3.connect(self.db_name, detect_types=sqlite3.PARSE_DECLTYPES,
+                                     check_same_thread=False, cached_statements=256)
+        for pragma in ('PRAGMA journal_mode=WAL',
+                       'PRAGMA synchronous=NORMAL',
+                       'PRAGMA temp_store=MEMORY',
+                       'PRAGMA cache_size=-20000'):
+            self._conn.execute(pragma)
+        atexit.register(self.close)
+
         self.init_database()
 
     def get_connection(self):
-        conn = sqlite3.connect(self.db_name, detect_types=sqlite3.PARSE_DECLTYPES)
-        return conn
+        return self._conn
+
+    def close(self):
+        if self._conn is None:
+            return
+        atexit.unregister(self.close)
+
+        # Let SQLite refresh planner statistics only for tables that need it
+        self._conn.execute('PRAGMA optimize')
+        self._conn.close()
+        self._conn = None
 
     def init_database(self):
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        # Create bikes table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS bikes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bike_type TEXT NOT NULL,
-                model TEXT NOT NULL,
-                hourly_rate REAL NOT NULL,
-                daily_rate REAL NOT NULL,
-                is_available BOOLEAN DEFAULT 1,
-                last_maintenance DATE
-            )
-        ''')
-
-        # Create customers table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS customers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                phone TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Create rentals table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS rentals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                customer_id INTEGER,
-                bike_id INTEGER,
-                rental_start TIMESTAMP NOT NULL,
-                rental_end TIMESTAMP,
-                planned_duration_hours INTEGER NOT NULL,
-                actual_duration_hours REAL,
-                base_cost REAL NOT NULL,
-                additional_charges REAL DEFAULT 0,
-                total_cost REAL NOT NULL,
-                status TEXT DEFAULT 'ACTIVE',
-                FOREIGN KEY (customer_id) REFERENCES customers (id),
-                FOREIGN KEY (bike_id) REFERENCES bikes (id)
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
+        # Create the schema and sample data in one transaction (a single WAL sync);
+        # commits on success, rolls back on error
+        with conn:
+            cursor.execute('BEGIN')
 
-        # Insert sample data if tables are empty
-        self.insert_sample_data()
+            # Create bikes table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS bikes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bike_type TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    hourly_rate REAL NOT NULL,
+                    daily_rate REAL NOT NULL,
+                    is_available BOOLEAN DEFAULT 1,
+                    last_maintenance DATE
+                )
+            ''')
+
+            # Create customers table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS customers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    email TEXT UNIQUE NOT NULL,
+                    phone TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+                )
+            ''')
+
+            # Create rentals table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS rentals (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    customer_id INTEGER,
+                    bike_id INTEGER,
+                    rental_start TIMESTAMP NOT NULL,
+                    rental_end TIMESTAMP,
+                    planned_duration_hours INTEGER NOT NULL,
+                    actual_duration_hours REAL,
+                    base_cost REAL NOT NULL,
+                    additional_charges REAL DEFAULT 0,
+                    total_cost REAL NOT NULL,
+                    status TEXT DEFAULT 'ACTIVE',
+                    FOREIGN KEY (customer_id) REFERENCES customers (id),
+                    FOREIGN KEY (bike_id) REFERENCES bikes (id)
+                )
+            ''')
+
+            # One-time migration of timestamps written as ISO text before they were stored as unix seconds
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] < 1:
+                # Rental times were naive local time; created_at came from CURRENT_TIMESTAMP (UTC)
+                for column in ('rental_start', 'rental_end'):
+                    cursor.execute(f'''
+                        UPDATE rentals SET {column} = CAST(strftime('%s', {column}, 'utc') AS INTEGER)
+                        WHERE typeof({column}) = 'text'
+                    ''')
+                cursor.execute('''
+                    UPDATE customers SET created_at = CAST(strftime('%s', created_at) AS INTEGER)
+                    WHERE typeof(created_at) = 'text'
+                ''')
+                cursor.execute('PRAGMA user_version = 1')
+
+            # Create indices for the customer/status and availability lookups
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_rentals_cust_status ON rentals(customer_id, status)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_rentals_bike ON rentals(bike_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_rentals_status ON rentals(status)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_bikes_avail ON bikes(is_available) WHERE is_available = 1')
+
+            # Insert sample data if tables are empty
+            self._insert_sample_rows(cursor)
+
+        # Gather planner statistics once so the indices above are used
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            conn.execute('ANALYZE')
 
     def insert_sample_data(self):
         conn = self.get_connection()
-        cursor = conn.cursor()
+        with conn:
+            self._insert_sample_rows(conn.cursor())
 
+    @staticmethod
+    def _insert_sample_rows(cursor):
         # Check if bikes table is empty
         cursor.execute("SELECT COUNT(*) FROM bikes")
         if cursor.fetchone()[0] == 0:
@@ -93,102 +207,88 @@ class DatabaseManager:
                 VALUES (?, ?, ?, ?, ?)
             ''', sample_bikes)
 
-        conn.commit()
-        conn.close()
 
+# Pricing formulas for each bike type, kept as plain functions of the rates
+def _cost_mountain(hours: int, hourly_rate: float, daily_rate: float) -> float:
+    if hours <= 4:
+        return hours * hourly_rate
+    return (hours // 24) * daily_rate + (hours % 24) * hourly_rate * 0.8  # 20% discount for partial days
 
-# Abstract base class for bikes
-class Bike(ABC):
-    def __init__(self, bike_id: int, bike_type: str, model: str, hourly_rate: float, daily_rate: float):
-        self.bike_id = bike_id
-        self.bike_type = bike_type
-        self.model = model
-        self.hourly_rate = hourly_rate
-        self.daily_rate = daily_rate
 
-    @abstractmethod
-    def calculate_rental_cost(self, hours: int) -> float:
-        pass
+def _cost_road(hours: int, hourly_rate: float, daily_rate: float) -> float:
+    if hours <= 3:
+        return hours * hourly_rate
+    return (hours // 24) * daily_rate + (hours % 24) * hourly_rate
 
-    @abstractmethod
-    def get_description(self) -> str:
-        pass
 
-    def __str__(self):
-        return f"{self.bike_type} - {self.model} (ID: {self.bike_id})"
+def _cost_hybrid(hours: int, hourly_rate: float, daily_rate: float) -> float:
+    if hours <= 6:
+        return hours * hourly_rate
+    # More favorable daily rate calculation for hybrid bikes
+    return (hours // 24) * daily_rate + (hours % 24) * hourly_rate * 0.9  # 10% discount
 
 
-# Concrete bike classes demonstrating inheritance and polymorphism
-class MountainBike(Bike):
-    def calculate_rental_cost(self, hours: int) -> float:
-        if hours <= 4:
-            return hours * self.hourly_rate
-        else:
-            days = hours // 24
-            remaining_hours = hours % 24
-            return (days * self.daily_rate) + (
-                        remaining_hours * self.hourly_rate * 0.8)  # 20% discount for partial days
+def _cost_electric(hours: int, hourly_rate: float, daily_rate: float) -> float:
+    base_cost = hours * hourly_rate if hours <= 8 else (hours // 24) * daily_rate + (hours % 24) * hourly_rate
+    # Add battery usage fee for electric bikes
+    return base_cost + hours * 2.0
 
-    def get_description(self) -> str:
-        return f"Mountain Bike - Perfect for off-road adventures and rugged terrain"
 
+_COST_FNS = {
+    'Mountain': _cost_mountain,
+    'Road': _cost_road,
+    'Hybrid': _cost_hybrid,
+    'Electric': _cost_electric
+}
 
-class RoadBike(Bike):
-    def calculate_rental_cost(self, hours: int) -> float:
-        if hours <= 3:
-            return hours * self.hourly_rate
-        else:
-            days = hours // 24
-            remaining_hours = hours % 24
-            return (days * self.daily_rate) + (remaining_hours * self.hourly_rate)
 
-    def get_description(self) -> str:
-        return f"Road Bike - Designed for speed and efficiency on paved surfaces"
+@functools.lru_cache(maxsize=64)
+def _sample_pricing(bike_type: str, hourly_rate: float, daily_rate: float) -> str:
+    # Bikes sharing a type and rates share the same preview, so format it once
+    cost_fn = _COST_FNS.get(bike_type, _cost_hybrid)
+    return " | ".join([f"{h}h: ${cost_fn(h, hourly_rate, daily_rate):.2f}" for h in _SAMPLE_HOURS])
 
 
-class HybridBike(Bike):
-    def calculate_rental_cost(self, hours: int) -> float:
-        if hours <= 6:
-            return hours * self.hourly_rate
-        else:
-            # More favorable daily rate calculation for hybrid bikes
-            days = hours // 24
-            remaining_hours = hours % 24
-            daily_cost = days * self.daily_rate
-            hourly_cost = remaining_hours * self.hourly_rate * 0.9  # 10% discount
-            return daily_cost + hourly_cost
+_DESCRIPTIONS = {
+    'Mountain': "Mountain Bike - Perfect for off-road adventures and rugged terrain",
+    'Road': "Road Bike - Designed for speed and efficiency on paved surfaces",
+    'Hybrid': "Hybrid Bike - Versatile option combining comfort and performance",
+    'Electric': "Electric Bike - Eco-friendly with pedal assistance (includes battery fee)"
+}
 
-    def get_description(self) -> str:
-        return f"Hybrid Bike - Versatile option combining comfort and performance"
 
+# Bike record; pricing and description are looked up by bike type
+@dataclass(frozen=True)
+class Bike:
+    __slots__ = ('bike_id', 'bike_type', 'model', 'hourly_rate', 'daily_rate')
+
+    bike_id: int
+    bike_type: str
+    model: str
+    hourly_rate: float
+    daily_rate: float
 
-class ElectricBike(Bike):
     def calculate_rental_cost(self, hours: int) -> float:
-        base_cost = hours * self.hourly_rate if hours <= 8 else (hours // 24) * self.daily_rate + (
-                    hours % 24) * self.hourly_rate
-        # Add battery usage fee for electric bikes
-        battery_fee = hours * 2.0
-        return base_cost + battery_fee
+        return _COST_FNS.get(self.bike_type, _cost_hybrid)(hours, self.hourly_rate, self.daily_rate)
 
     def get_description(self) -> str:
-        return f"Electric Bike - Eco-friendly with pedal assistance (includes battery fee)"
+        return _DESCRIPTIONS.get(self.bike_type, _DESCRIPTIONS['Hybrid'])
+
+    def __str__(self):
+        return f"{self.bike_type} - {self.model} (ID: {self.bike_id})"
 
 
 # Factory pattern for creating bike objects
 class BikeFactory:
     @staticmethod
     def create_bike(bike_data: tuple) -> Bike:
-        bike_id, bike_type, model, hourly_rate, daily_rate = bike_data[:5]
+        return BikeFactory._build_bike(*bike_data)
 
-        bike_classes = {
-            'Mountain': MountainBike,
-            'Road': RoadBike,
-            'Hybrid': HybridBike,
-            'Electric': ElectricBike
-        }
-
-        bike_class = bike_classes.get(bike_type, HybridBike)
-        return bike_class(bike_id, bike_type, model, hourly_rate, daily_rate)
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _build_bike(bike_id: int, bike_type: str, model: str, hourly_rate: float, daily_rate: float) -> Bike:
+        # Bike attributes rarely change, so identical rows reuse the same object
+        return Bike(bike_id, bike_type, model, hourly_rate, daily_rate)
 
 
 # Customer class
@@ -208,49 +308,55 @@ class BikeRentalSystem:
     def __init__(self):
         self.db_manager = DatabaseManager()
         self.current_customer = None
+        # Customers already looked up this session, keyed by email
+        self._customer_cache: Dict[str, Customer] = {}
 
     def register_customer(self, name: str, email: str, phone: str) -> bool:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
 
         try:
-            cursor.execute('''
-                INSERT INTO customers (name, email, phone)
-                VALUES (?, ?, ?)
-            ''', (name, email, phone))
-            conn.commit()
+            with conn:
+                # Set created_at explicitly; tables created before the integer format keep a text default
+                cursor.execute('''
+                    INSERT INTO customers (name, email, phone, created_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (name, email, phone, _now_epoch()))
+            self._customer_cache.pop(email, None)
             print(f"✓ Customer {name} registered successfully!")
             return True
         except sqlite3.IntegrityError:
             print(f"✗ Email {email} already exists!")
             return False
-        finally:
-            conn.close()
 
     def login_customer(self, email: str) -> bool:
+        customer = self._customer_cache.get(email)
+        if customer:
+            self.current_customer = customer
+            print(f"✓ Welcome back, {self.current_customer.name}!")
+            return True
+
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('SELECT * FROM customers WHERE email = ?', (email,))
+        cursor.execute('SELECT id, name, email, phone FROM customers WHERE email = ?', (email,))
         customer_data = cursor.fetchone()
 
         if customer_data:
-            self.current_customer = Customer(*customer_data[:4])
+            self.current_customer = Customer(*customer_data)
+            self._customer_cache[email] = self.current_customer
             print(f"✓ Welcome back, {self.current_customer.name}!")
-            conn.close()
             return True
         else:
             print("✗ Customer not found!")
-            conn.close()
             return False
 
     def get_available_bikes(self) -> List[Bike]:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('SELECT * FROM bikes WHERE is_available = 1')
+        cursor.execute(_SQL_GET_AVAILABLE_BIKES)
         bike_data = cursor.fetchall()
-        conn.close()
 
         return [BikeFactory.create_bike(bike) for bike in bike_data]
 
@@ -260,24 +366,17 @@ class BikeRentalSystem:
             print("No bikes available for rent.")
             return
 
-        print("\n" + "=" * 80)
-        print("AVAILABLE BIKES FOR RENT")
-        print("=" * 80)
+        parts = ["\n" + "=" * 80 + "\n",
+                 "AVAILABLE BIKES FOR RENT\n",
+                 "=" * 80 + "\n"]
 
         for bike in bikes:
-            print(f"\n🚴 ID: {bike.bike_id}")
-            print(f"   {bike.get_description()}")
-            print(f"   Model: {bike.model}")
-            print(f"   Rates: ${bike.hourly_rate:.2f}/hour | ${bike.daily_rate:.2f}/day")
-
-            # Show sample pricing
-            sample_costs = [
-                (2, bike.calculate_rental_cost(2)),
-                (8, bike.calculate_rental_cost(8)),
-                (24, bike.calculate_rental_cost(24))
-            ]
-            print(f"   Sample pricing: ", end="")
-            print(" | ".join([f"{h}h: ${c:.2f}" for h, c in sample_costs]))
+            parts.append(_BIKE_ROW % (bike.bike_id, bike.get_description(), bike.model,
+                                      bike.hourly_rate, bike.daily_rate,
+                                      _sample_pricing(bike.bike_type, bike.hourly_rate, bike.daily_rate)))
+
+        # Emit the whole listing with a single write
+        sys.stdout.write("".join(parts))
 
     def rent_bike(self, bike_id: int, duration_hours: int) -> bool:
         if not self.current_customer:
@@ -292,31 +391,26 @@ class BikeRentalSystem:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
 
-        # Check if bike exists and is available
-        cursor.execute('SELECT * FROM bikes WHERE id = ? AND is_available = 1', (bike_id,))
-        bike_data = cursor.fetchone()
-
-        if not bike_data:
-            print("✗ Bike not available or doesn't exist!")
-            conn.close()
-            return False
-
         try:
-            # Create bike object and calculate cost
-            bike = BikeFactory.create_bike(bike_data)
-            total_cost = bike.calculate_rental_cost(duration_hours)
+            with conn:
+                # Mark the bike as unavailable and read it back, only if it exists and is available
+                cursor.execute(_SQL_RESERVE_BIKE, (bike_id,))
+                bike_data = cursor.fetchone()
 
-            # Create rental record
-            rental_start = datetime.now()
-            cursor.execute('''
-                INSERT INTO rentals (customer_id, bike_id, rental_start, planned_duration_hours, base_cost, total_cost)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (self.current_customer.customer_id, bike_id, rental_start, duration_hours, total_cost, total_cost))
+                if not bike_data:
+                    conn.rollback()
+                    print("✗ Bike not available or doesn't exist!")
+                    return False
+
+                # Create bike object and calculate cost
+                bike = BikeFactory.create_bike(bike_data)
+                total_cost = bike.calculate_rental_cost(duration_hours)
 
-            # Mark bike as unavailable
-            cursor.execute('UPDATE bikes SET is_available = 0 WHERE id = ?', (bike_id,))
+                # Create rental record
+                rental_start = _now_epoch()
+                cursor.execute(_SQL_INSERT_RENTAL, (self.current_customer.customer_id, bike_id, rental_start,
+                                                    duration_hours, total_cost, total_cost))
 
-            conn.commit()
             rental_id = cursor.lastrowid
 
             print(f"\n✓ RENTAL CONFIRMED!")
@@ -324,16 +418,13 @@ class BikeRentalSystem:
             print(f"   Bike: {bike}")
             print(f"   Duration: {duration_hours} hours")
             print(f"   Total Cost: ${total_cost:.2f}")
-            print(f"   Rental Start: {rental_start.strftime('%Y-%m-%d %H:%M')}")
+            print(f"   Rental Start: {time.strftime('%Y-%m-%d %H:%M', time.localtime(rental_start))}")
 
             return True
 
         except Exception as e:
-            conn.rollback()
             print(f"✗ Error processing rental: {e}")
             return False
-        finally:
-            conn.close()
 
     def return_bike(self, rental_id: int) -> bool:
         if not self.current_customer:
@@ -344,56 +435,41 @@ class BikeRentalSystem:
         cursor = conn.cursor()
 
         try:
-            # Get rental information with proper column selection
-            cursor.execute('''
-                SELECT r.id, r.customer_id, r.bike_id, r.rental_start, r.rental_end, 
-                       r.planned_duration_hours, r.base_cost, r.additional_charges, r.total_cost, r.status,
-                       b.bike_type, b.model, b.hourly_rate, b.daily_rate
-                FROM rentals r
-                JOIN bikes b ON r.bike_id = b.id
-                WHERE r.id = ? AND r.customer_id = ? AND r.status = 'ACTIVE'
-            ''', (rental_id, self.current_customer.customer_id))
+            with conn:
+                # Get rental information with proper column selection
+                cursor.execute(_SQL_GET_ACTIVE_RENTAL, (rental_id, self.current_customer.customer_id))
 
-            rental_data = cursor.fetchone()
+                rental_data = cursor.fetchone()
 
-            if not rental_data:
-                print("✗ Active rental not found!")
-                return False
+                if not rental_data:
+                    print("✗ Active rental not found!")
+                    return False
 
-            # Extract data with correct indices
-            (rental_id_db, customer_id, bike_id, rental_start, rental_end,
-             planned_duration, base_cost, additional_charges, total_cost, status,
-             bike_type, model, hourly_rate, daily_rate) = rental_data
+                # Extract data with correct indices
+                (rental_id_db, customer_id, bike_id, rental_start, rental_end,
+                 planned_duration, base_cost, additional_charges, total_cost, status,
+                 bike_type, model, hourly_rate, daily_rate) = rental_data
 
-            # Calculate actual duration and any additional charges
-            rental_end_time = datetime.now()
-            actual_duration = (rental_end_time - rental_start).total_seconds() / 3600  # in hours
+                # Calculate actual duration and any additional charges
+                rental_end_time = _now_epoch()
+                actual_duration = (rental_end_time - int(rental_start.timestamp())) / 3600.0  # in hours
 
-            # Create bike object for cost calculation
-            bike = BikeFactory.create_bike((bike_id, bike_type, model, hourly_rate, daily_rate))
+                # Create bike object for cost calculation
+                bike = BikeFactory.create_bike((bike_id, bike_type, model, hourly_rate, daily_rate))
 
-            additional_charges_new = 0
-            if actual_duration > planned_duration:
-                overtime_hours = actual_duration - planned_duration
-                additional_charges_new = overtime_hours * bike.hourly_rate * 1.5  # 50% penalty for overtime
+                additional_charges_new = 0
+                if actual_duration > planned_duration:
+                    overtime_hours = actual_duration - planned_duration
+                    additional_charges_new = overtime_hours * bike.hourly_rate * 1.5  # 50% penalty for overtime
 
-            final_cost = base_cost + additional_charges_new
-
-            # Update rental record
-            cursor.execute('''
-                UPDATE rentals SET 
-                    rental_end = ?, 
-                    actual_duration_hours = ?, 
-                    additional_charges = ?, 
-                    total_cost = ?,
-                    status = 'COMPLETED'
-                WHERE id = ?
-            ''', (rental_end_time, actual_duration, additional_charges_new, final_cost, rental_id))
+                final_cost = base_cost + additional_charges_new
 
-            # Mark bike as available
-            cursor.execute('UPDATE bikes SET is_available = 1 WHERE id = ?', (bike_id,))
+                # Update rental record
+                cursor.execute(_SQL_COMPLETE_RENTAL, (rental_end_time, actual_duration, additional_charges_new,
+                                                      final_cost, rental_id))
 
-            conn.commit()
+                # Mark bike as available
+                cursor.execute(_SQL_RELEASE_BIKE, (bike_id,))
 
             print(f"\n✓ BIKE RETURNED SUCCESSFULLY!")
             print(f"   Rental ID: {rental_id}")
@@ -407,11 +483,8 @@ class BikeRentalSystem:
             return True
 
         except Exception as e:
-            conn.rollback()
             print(f"✗ Error processing return: {e}")
             return False
-        finally:
-            conn.close()
 
     def view_rental_history(self):
         if not self.current_customer:
@@ -431,64 +504,52 @@ class BikeRentalSystem:
             ORDER BY r.rental_start DESC
         ''', (self.current_customer.customer_id,))
 
-        rentals = cursor.fetchall()
-        conn.close()
+        # Stream rows straight from the cursor; the header is printed with the first row
+        found = False
+        for rental in cursor:
+            if not found:
+                print(f"\n" + "=" * 80)
+                print(f"RENTAL HISTORY FOR {self.current_customer.name}")
+                print("=" * 80)
+                found = True
 
-        if not rentals:
-            print("No rental history found.")
-            return
-
-        print(f"\n" + "=" * 80)
-        print(f"RENTAL HISTORY FOR {self.current_customer.name}")
-        print("=" * 80)
-
-        for rental in rentals:
             (rental_id, bike_id, start_time, end_time, planned_duration,
              actual_duration, total_cost, status, bike_type, model) = rental
 
-            print(f"\n📋 Rental ID: {rental_id}")
-            print(f"   Bike: {bike_type} - {model}")
-            print(f"   Start: {start_time.strftime('%Y-%m-%d %H:%M')}")
+            start = start_time.strftime('%Y-%m-%d %H:%M')
             if end_time:
-                print(f"   End: {end_time.strftime('%Y-%m-%d %H:%M')}")
-                print(f"   Duration: {actual_duration:.2f} hours")
+                sys.stdout.write(_RENTAL_ROW_COMPLETED % (rental_id, bike_type, model, start,
+                                                          end_time.strftime('%Y-%m-%d %H:%M'),
+                                                          actual_duration, total_cost, status))
             else:
-                print(f"   Planned Duration: {planned_duration} hours")
-            print(f"   Cost: ${total_cost:.2f}")
-            print(f"   Status: {status}")
+                sys.stdout.write(_RENTAL_ROW_OPEN % (rental_id, bike_type, model, start,
+                                                     planned_duration, total_cost, status))
+
+        if not found:
+            print("No rental history found.")
 
     def generate_business_report(self):
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
 
-        # Total revenue
-        cursor.execute('SELECT SUM(total_cost) FROM rentals WHERE status = "COMPLETED"')
-        total_revenue = cursor.fetchone()[0] or 0
-
-        # Total rentals
-        cursor.execute('SELECT COUNT(*) FROM rentals')
-        total_rentals = cursor.fetchone()[0]
-
-        # Active rentals
-        cursor.execute('SELECT COUNT(*) FROM rentals WHERE status = "ACTIVE"')
-        active_rentals = cursor.fetchone()[0]
-
-        # Most popular bike type
+        # Revenue, rental counts, average duration and most popular bike type in one pass
         cursor.execute('''
-            SELECT b.bike_type, COUNT(*) as rental_count
-            FROM rentals r
-            JOIN bikes b ON r.bike_id = b.id
-            GROUP BY b.bike_type
-            ORDER BY rental_count DESC
-            LIMIT 1
+            SELECT SUM(CASE WHEN status = 'COMPLETED' THEN total_cost END),
+                   COUNT(*),
+                   SUM(CASE WHEN status = 'ACTIVE' THEN 1 ELSE 0 END),
+                   AVG(actual_duration_hours),
+                   (SELECT b.bike_type
+                    FROM rentals r
+                    JOIN bikes b ON r.bike_id = b.id
+                    GROUP BY b.bike_type
+                    ORDER BY COUNT(*) DESC
+                    LIMIT 1)
+            FROM rentals
         ''')
-        popular_bike = cursor.fetchone()
-
-        # Average rental duration
-        cursor.execute('SELECT AVG(actual_duration_hours) FROM rentals WHERE actual_duration_hours IS NOT NULL')
-        avg_duration = cursor.fetchone()[0] or 0
-
-        conn.close()
+        total_revenue, total_rentals, active_rentals, avg_duration, popular_bike = cursor.fetchone()
+        total_revenue = total_revenue or 0
+        active_rentals = active_rentals or 0
+        avg_duration = avg_duration or 0
 
         print(f"\n" + "=" * 60)
         print("BUSINESS ANALYTICS REPORT")
@@ -496,10 +557,65 @@ class BikeRentalSystem:
         print(f"📊 Total Revenue: ${total_revenue:.2f}")
         print(f"📈 Total Rentals: {total_rentals}")
         print(f"🔄 Active Rentals: {active_rentals}")
-        print(f"🚴 Most Popular Bike Type: {popular_bike[0] if popular_bike else 'N/A'}")
+        print(f"🚴 Most Popular Bike Type: {popular_bike or 'N/A'}")
         print(f"⏱️  Average Rental Duration: {avg_duration:.2f} hours")
 
 
+# Menu handlers; returning _EXIT ends the main loop
+_EXIT = object()
+
+
+def _handle_register(system: BikeRentalSystem):
+    name = input("Enter name: ")
+    email = input("Enter email: ")
+    phone = input("Enter phone: ")
+    system.register_customer(name, email, phone)
+
+
+def _handle_login(system: BikeRentalSystem):
+    email = input("Enter email: ")
+    system.login_customer(email)
+
+
+def _handle_rent(system: BikeRentalSystem):
+    if not system.current_customer:
+        print("Please login first!")
+        return
+    system.display_available_bikes()
+    try:
+        bike_id = int(input("\nEnter bike ID to rent: "))
+        duration = int(input("Enter rental duration (hours): "))
+        system.rent_bike(bike_id, duration)
+    except ValueError:
+        print("✗ Please enter valid numbers for bike ID and duration!")
+
+
+def _handle_return(system: BikeRentalSystem):
+    if not system.current_customer:
+        print("Please login first!")
+        return
+    try:
+        rental_id = int(input("Enter rental ID to return: "))
+        system.return_bike(rental_id)
+    except ValueError:
+        print("✗ Please enter a valid rental ID!")
+
+
+def _handle_exit(system: BikeRentalSystem):
+    print("Thank you for using Bike Rental System!")
+    return _EXIT
+
+
+_HANDLERS = {
+    '1': _handle_register,
+    '2': _handle_login,
+    '3': _handle_rent,
+    '4': _handle_return,
+    '5': lambda system: system.generate_business_report(),
+    '6': _handle_exit
+}
+
+
 # Main application interface
 def main():
     system = BikeRentalSystem()
@@ -522,47 +638,13 @@ def main():
         try:
             choice = input("\nEnter your choice (1-6): ").strip()
 
-            if choice == '1':
-                name = input("Enter name: ")
-                email = input("Enter email: ")
-                phone = input("Enter phone: ")
-                system.register_customer(name, email, phone)
-
-            elif choice == '2':
-                email = input("Enter email: ")
-                system.login_customer(email)
-
-            elif choice == '3':
-                if not system.current_customer:
-                    print("Please login first!")
-                    continue
-                system.display_available_bikes()
-                try:
-                    bike_id = int(input("\nEnter bike ID to rent: "))
-                    duration = int(input("Enter rental duration (hours): "))
-                    system.rent_bike(bike_id, duration)
-                except ValueError:
-                    print("✗ Please enter valid numbers for bike ID and duration!")
-
-            elif choice == '4':
-                if not system.current_customer:
-                    print("Please login first!")
-                    continue
-                try:
-                    rental_id = int(input("Enter rental ID to return: "))
-                    system.return_bike(rental_id)
-                except ValueError:
-                    print("✗ Please enter a valid rental ID!")
-
-            elif choice == '5':
-                system.generate_business_report()
-
-            elif choice == '6':
-                print("Thank you for using Bike Rental System!")
-                break
-
-            else:
+            handler = _HANDLERS.get(choice)
+            if handler is None:
                 print("Invalid choice! Please try again.")
+                continue
+
+            if handler(system) is _EXIT:
+                break
 
         except (ValueError, KeyboardInterrupt):
             print("\nInvalid input! Please try again.")